@@ -10,9 +10,14 @@ import os
 import sys
 import subprocess
 import json
+import hashlib
 import platform
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Records the dependency manifest hash from the last successful install
+SETUP_STAMP_FILE = '.mcp-setup-stamp'
+
 class MCPVulnScannerSetup:
     def __init__(self):
         self.project_root = Path(__file__).parent.absolute()
@@ -40,17 +45,26 @@ class MCPVulnScannerSetup:
         }
         
         missing_tools = []
+        results = {}
+        
+        # Run the version checks concurrently; each one is a separate process
+        with ThreadPoolExecutor(max_workers=len(required_tools)) as executor:
+            futures = {
+                executor.submit(subprocess.run, command, capture_output=True, text=True): tool
+                for tool, command in required_tools.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except FileNotFoundError:
+                    results[futures[future]] = None
         
-        for tool, command in required_tools.items():
-            try:
-                result = subprocess.run(command, capture_output=True, text=True)
-                if result.returncode == 0:
-                    version = result.stdout.strip().split('\n')[0]
-                    print(f"  ✅ {tool}: {version}")
-                else:
-                    missing_tools.append(tool)
-                    print(f"  ❌ {tool}: Not found")
-            except FileNotFoundError:
+        for tool in required_tools:
+            result = results[tool]
+            if result is not None and result.returncode == 0:
+                version = result.stdout.strip().split('\n')[0]
+                print(f"  ✅ {tool}: {version}")
+            else:
                 missing_tools.append(tool)
                 print(f"  ❌ {tool}: Not found")
         
@@ -62,24 +76,114 @@ class MCPVulnScannerSetup:
         print("✅ All prerequisites satisfied!")
         return True
 
+    def _run_project_setups(self, setup_project, projects):
+        """Run setup_project for each existing project concurrently
+
+        Each project's messages are printed as one block once it finishes,
+        so concurrent setups never interleave on the terminal.
+        """
+        results = []
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(setup_project, project, self.project_root / project)
+                for project in projects
+                if (self.project_root / project).exists()
+            ]
+            for future in as_completed(futures):
+                succeeded, log = future.result()
+                print("\n".join(log))
+                results.append(succeeded)
+        
+        return all(results)
+
+    def _run_captured(self, command, project_path):
+        """Run a setup command, capturing its output instead of writing to the terminal"""
+        subprocess.run(
+            command,
+            cwd=project_path,
+            check=True,
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+
+    def _failure_log(self, project, error):
+        """Describe a failed setup command, including everything it printed"""
+        return [f"  ❌ Failed to setup {project}", (error.output or "").rstrip()]
+
+    def _dependency_hash(self, project_path, manifests):
+        """Hash the dependency manifests present in a project"""
+        digest = hashlib.sha256()
+        for manifest in manifests:
+            manifest_path = project_path / manifest
+            if manifest_path.exists():
+                digest.update(manifest.encode())
+                digest.update(manifest_path.read_bytes())
+        return digest.hexdigest()
+
+    def _dependencies_up_to_date(self, project_path, manifests, install_dir):
+        """Check whether dependencies were installed from the current manifests"""
+        stamp = project_path / SETUP_STAMP_FILE
+        return (
+            (project_path / install_dir).exists()
+            and stamp.exists()
+            and stamp.read_text() == self._dependency_hash(project_path, manifests)
+        )
+
+    def _write_setup_stamp(self, project_path, manifests):
+        """Record the manifests the dependencies were installed from"""
+        stamp = project_path / SETUP_STAMP_FILE
+        stamp.write_text(self._dependency_hash(project_path, manifests))
+
+    def _setup_python_project(self, project, project_path):
+        """Install dependencies for a single Python project
+
+        Returns whether setup succeeded and the lines to print for it.
+        """
+        manifests = ['pyproject.toml', 'uv.lock']
+        if self._dependencies_up_to_date(project_path, manifests, '.venv'):
+            return True, [f"  ⏭️  {project} dependencies unchanged, skipping"]
+        
+        log = [f"  📦 Installing dependencies for {project}"]
+        try:
+            self._run_captured(['uv', 'sync'], project_path)
+            self._write_setup_stamp(project_path, manifests)
+            log.append(f"  ✅ {project} setup complete")
+            return True, log
+        except subprocess.CalledProcessError as e:
+            return False, log + self._failure_log(project, e)
+
+    def _setup_node_project(self, project, project_path):
+        """Install and build a single Node.js project
+
+        Returns whether setup succeeded and the lines to print for it.
+        """
+        manifests = ['package.json', 'package-lock.json']
+        log = []
+        try:
+            if self._dependencies_up_to_date(project_path, manifests, 'node_modules'):
+                log.append(f"  ⏭️  {project} dependencies unchanged, skipping install")
+            else:
+                log.append(f"  📦 Installing dependencies for {project}")
+                self._run_captured(['npm', 'install'], project_path)
+                self._write_setup_stamp(project_path, manifests)
+                log.append(f"  ✅ {project} dependencies installed")
+            
+            # Build TypeScript projects
+            if 'gemini' in project:
+                self._run_captured(['npm', 'run', 'build'], project_path)
+                log.append(f"  🔨 {project} built successfully")
+            return True, log
+        except subprocess.CalledProcessError as e:
+            return False, log + self._failure_log(project, e)
+
     def setup_python_projects(self):
         """Set up Python projects using UV"""
         print("\n🐍 Setting up Python projects...")
         
         python_projects = ['src/mcp-security', 'src/sqlite']
         
-        for project in python_projects:
-            project_path = self.project_root / project
-            if project_path.exists():
-                print(f"  📦 Installing dependencies for {project}")
-                try:
-                    subprocess.run(['uv', 'sync'], cwd=project_path, check=True)
-                    print(f"  ✅ {project} setup complete")
-                except subprocess.CalledProcessError:
-                    print(f"  ❌ Failed to setup {project}")
-                    return False
-        
-        return True
+        return self._run_project_setups(self._setup_python_project, python_projects)
 
     def setup_node_projects(self):
         """Set up Node.js projects"""
@@ -87,24 +191,7 @@ class MCPVulnScannerSetup:
         
         node_projects = ['src/gemini-mcp-server', 'src/filesystem']
         
-        for project in node_projects:
-            project_path = self.project_root / project
-            if project_path.exists():
-                print(f"  📦 Installing dependencies for {project}")
-                try:
-                    subprocess.run(['npm', 'install'], cwd=project_path, check=True)
-                    print(f"  ✅ {project} dependencies installed")
-                    
-                    # Build TypeScript projects
-                    if 'gemini' in project:
-                        subprocess.run(['npm', 'run', 'build'], cwd=project_path, check=True)
-                        print(f"  🔨 {project} built successfully")
-                        
-                except subprocess.CalledProcessError:
-                    print(f"  ❌ Failed to setup {project}")
-                    return False
-        
-        return True
+        return self._run_project_setups(self._setup_node_project, node_projects)
 
     def create_config_template(self):
         """Create Claude Desktop configuration template"""
@@ -118,7 +205,7 @@ class MCPVulnScannerSetup:
                         "--directory",
                         str(self.project_root / "src/mcp-security"),
                         "run",
-                        "mcp-security.py"
+                        "mcp_security.py"
                     ]
                 },
                 "gemini": {
@@ -0,0 +1,519 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
+import os
+import re
+import shlex
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from mcp.server.fastmcp import FastMCP
+
+# Initialize FastMCP server
+mcp = FastMCP("nmap")
+
+# Resolve the Nmap binary once so each scan skips the PATH lookup
+NMAP_BIN = shutil.which("nmap") or "nmap"
+
+# Seconds a custom Nmap command may run before its process group is killed
+CUSTOM_COMMAND_TIMEOUT = 120
+
+# Recent scan results, keyed on the Nmap argument tuple and line limit
+SCAN_CACHE_TTL = 300
+SCAN_CACHE_MAXSIZE = 256
+_scan_cache: dict[tuple[tuple[str, ...], int | None], tuple[float, str]] = {}
+# Scans fanned out across worker threads share the cache
+_scan_cache_lock = threading.Lock()
+
+# Scans with these flags write output files or read hosts from files whose
+# contents may change, so they must always run. Matched as prefixes to also
+# catch attached values such as -iLhosts.txt or --excludefile=skip.txt
+_UNCACHEABLE_FLAGS = ("-oN", "-oX", "-oA", "-oG", "-oS", "-iL", "--excludefile")
+
+def _get_cached_scan(key: tuple[tuple[str, ...], int | None]) -> str | None:
+    """Return a cached scan result if it has not expired."""
+    with _scan_cache_lock:
+        entry = _scan_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, output = entry
+        if time.monotonic() - stored_at > SCAN_CACHE_TTL:
+            _scan_cache.pop(key, None)
+            return None
+        return output
+
+def _store_cached_scan(key: tuple[tuple[str, ...], int | None], output: str) -> None:
+    """Cache a scan result, evicting the oldest entry when full."""
+    with _scan_cache_lock:
+        _scan_cache.pop(key, None)
+        while len(_scan_cache) >= SCAN_CACHE_MAXSIZE:
+            _scan_cache.pop(next(iter(_scan_cache)), None)
+        _scan_cache[key] = (time.monotonic(), output)
+
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    """Kill a process started with start_new_session=True and everything in its group."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.kill()
+
+def _stream_nmap_output(args: list[str], max_lines: int, timeout: int) -> tuple[str, bool]:
+    """Read Nmap output line by line and stop the scan once max_lines lines are read.
+
+    Returns the collected output and whether the scan succeeded.
+    """
+    if max_lines < 1:
+        return "", True
+    lines = []
+    stopped_early = False
+    timed_out = threading.Event()
+    with subprocess.Popen(
+        [NMAP_BIN, *args],
+        executable=NMAP_BIN,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        # Own session, so a timeout also kills children still holding the pipe open.
+        # This rules out posix_spawn, so close_fds=False would gain nothing here
+        start_new_session=True
+    ) as proc:
+        def kill_on_timeout() -> None:
+            timed_out.set()
+            _kill_process_group(proc)
+
+        timer = threading.Timer(timeout, kill_on_timeout)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                lines.append(line)
+                if len(lines) >= max_lines:
+                    stopped_early = True
+                    proc.terminate()
+                    break
+        finally:
+            timer.cancel()
+            # Give a terminated Nmap a few seconds to exit before forcing it
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(proc)
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired([NMAP_BIN, *args], timeout)
+    return "".join(lines), stopped_early or proc.returncode == 0
+
+def run_nmap_command(args: list[str], max_lines: int | None = None) -> str:
+    """Run a safe Nmap command and return the output.
+
+    When max_lines is given, output is streamed and the scan is stopped as
+    soon as that many lines have been read.
+
+    Successful results are reused for SCAN_CACHE_TTL seconds, except for
+    scans that write output files or read hosts from files.
+    """
+    key = (tuple(args), max_lines)
+    cacheable = not any(arg.startswith(_UNCACHEABLE_FLAGS) for arg in args)
+    if cacheable:
+        cached = _get_cached_scan(key)
+        if cached is not None:
+            return cached
+    try:
+        if max_lines is not None:
+            output, succeeded = _stream_nmap_output(args, max_lines, timeout=60)
+        else:
+            result = subprocess.run(
+                [NMAP_BIN, *args],
+                executable=NMAP_BIN,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=60,
+                close_fds=False
+            )
+            output, succeeded = result.stdout, result.returncode == 0
+    except Exception as e:
+        return f"Error running Nmap: {str(e)}"
+    if cacheable and succeeded:
+        _store_cached_scan(key, output)
+    return output
+
+# Static argument prefixes shared by the tools below
+_FULL_SCAN_ARGV = ("-sS", "-sV", "-T4", "-A")
+_HTTP_TITLE_ARGV = ("-p", "80", "--script", "http-title")
+_VULSCAN_ARGV = ("-sV", "--script=vulscan/vulscan.nse")
+
+@mcp.tool()
+def clear_scan_cache() -> str:
+    """Discard cached scan results so the next scans run Nmap again."""
+    with _scan_cache_lock:
+        count = len(_scan_cache)
+        _scan_cache.clear()
+    return f"Cleared {count} cached scan result(s)."
+
+# Tools that run a fixed argument list against a single target, as
+# (name, argv, description[, target description])
+_TARGET_TOOLS = [
+    ("simple_scan", ("-T4",), "Perform a basic Nmap scan on the target."),
+    ("os_detection", ("-O",), "Attempt OS detection on a target."),
+    ("full_scan", _FULL_SCAN_ARGV, "Perform a full TCP scan with service detection."),
+    ("ping_scan", ("-sn",), "Perform a Ping Scan to check if the host is up."),
+    ("http_title_scan", _HTTP_TITLE_ARGV, "Scan for HTTP titles on port 80."),
+    ("traceroute_scan", ("--traceroute",), "Perform a traceroute to the target."),
+    ("single_host_scan", (), "Scan a single host for 1000 well-known ports.",
+     "IP address or hostname (e.g., scanme.nmap.org)"),
+    ("verbose_scan", ("-v",), "Perform a scan with verbose output for detailed information."),
+]
+
+def _make_target_tool(
+    name: str,
+    argv: tuple[str, ...],
+    description: str,
+    target_description: str = "IP address or hostname"
+):
+    """Build a tool function that scans one target with a fixed argument list."""
+    def tool(target: str) -> str:
+        return run_nmap_command([*argv, target])
+
+    tool.__name__ = tool.__qualname__ = name
+    tool.__doc__ = f"""{description}
+
+    Args:
+        target: {target_description}
+    """
+    return tool
+
+def _register_target_tools() -> None:
+    """Register each _TARGET_TOOLS entry with the server and bind it in this module."""
+    for name, *spec in _TARGET_TOOLS:
+        globals()[name] = mcp.tool()(_make_target_tool(name, *spec))
+
+_register_target_tools()
+
+@mcp.tool()
+def port_scan(target: str, ports: str) -> str:
+    """Scan specific ports on a target.
+
+    Args:
+        target: IP address or hostname
+        ports: Port range (e.g., 20-80 or 22,80,443)
+    """
+    return run_nmap_command(["-p", ports, "-T4", target])
+
+@mcp.tool()
+def scan_specific_port(target: str, port: str) -> str:
+    """Scan a specific port on the target.
+
+    Args:
+        target: IP address or hostname
+        port: Port number (e.g., 80)
+    """
+    return run_nmap_command(["-p", port, "-T4", target])
+
+@mcp.tool()
+def scan_port_range(target: str, port_range: str) -> str:
+    """Scan a range of ports on the target.
+
+    Args:
+        target: IP address or hostname
+        port_range: Port range (e.g., 1-1000)
+    """
+    return run_nmap_command(["-p", port_range, "-T4", target])
+
+@mcp.tool()
+def combined_recon(target: str, do_os: bool = True, do_services: bool = True, do_traceroute: bool = True) -> str:
+    """Run OS detection, service version detection, and traceroute in a single Nmap scan.
+
+    Prefer this over calling os_detection, scan(kind="service_version"), and
+    traceroute_scan one after another, since host discovery is done only once.
+
+    Args:
+        target: IP address or hostname
+        do_os: Include OS detection (-O)
+        do_services: Include service version detection (-sV)
+        do_traceroute: Include traceroute (--traceroute)
+    """
+    flags = zip(["-O", "-sV", "--traceroute"], [do_os, do_services, do_traceroute])
+    return run_nmap_command([flag for flag, enabled in flags if enabled] + [target])
+
+# Vulscan tools
+@mcp.tool()
+def vulscan_basic(target: str, database: str = "cve.csv") -> str:
+    """Perform a vulnerability scan using Vulscan with a specific database."""
+    return run_nmap_command([
+        *_VULSCAN_ARGV,
+        "--script-args", f"\"vulscandb={database}\"",
+        target
+    ])
+
+
+@mcp.tool()
+def vulscan_output_limit(target: str, database: str = "cve.csv", limit: int = 10) -> str:
+    """Perform a vulnerability scan and limit the number of results."""
+    command_args = [
+        *_VULSCAN_ARGV,
+        "--script-args", f"\"vulscandb={database},vulscanshowall=0,vulscanoutput='{{id}} - {{title}}'\"",
+        target
+    ]
+    # Stop Nmap once enough lines have been collected instead of discarding the rest
+    limited_results = run_nmap_command(command_args, max_lines=limit)
+    return limited_results.rstrip("\n")
+
+
+@mcp.tool()
+def vulscan_interactive(target: str, database: str = "cve.csv") -> str:
+    """Run Vulscan in interactive mode to manually select vulnerabilities to report."""
+    return run_nmap_command([
+        *_VULSCAN_ARGV,
+        "--script-args", f"\"vulscandb={database},vulscaninteractive=1\"",
+        target
+    ])
+
+
+@mcp.tool()
+def vulscan_custom_output(target: str, database: str = "cve.csv", custom_template: str = '{id} - {title}') -> str:
+    """Run Vulscan with a custom output format."""
+    return run_nmap_command([
+        *_VULSCAN_ARGV,
+        "--script-args", f"\"vulscandb={database},vulscanoutput='{custom_template}'\"",
+        target
+    ])
+
+@mcp.tool()
+def ping_subnet_scan(subnet: str) -> str:
+    """Perform a ping scan to discover active devices on a subnet.
+    
+    Args:
+        subnet: Network subnet (e.g., 192.168.1.1/24)
+    """
+    return run_nmap_command(["-sP", subnet])
+
+@mcp.tool()
+def scan_multiple_hosts(hosts: str, workers: int = 1) -> str:
+    """Scan multiple hosts simultaneously.
+    
+    Args:
+        hosts: Space-separated list of hosts (e.g., "192.168.1.1 192.168.1.2")
+        workers: Number of Nmap processes to split the hosts across (default: 1, capped at the CPU count)
+    """
+    host_list = hosts.split()
+    workers = min(workers, len(host_list), os.cpu_count() or 1)
+    if workers <= 1:
+        return run_nmap_command(host_list)
+
+    # Give each Nmap process a contiguous share of the hosts
+    chunk_size = -(-len(host_list) // workers)
+    chunks = [host_list[i:i + chunk_size] for i in range(0, len(host_list), chunk_size)]
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        return "\n".join(executor.map(run_nmap_command, chunks))
+
+@mcp.tool()
+def scan_ip_range(ip_range: str) -> str:
+    """Scan a range of IP addresses using wildcards or hyphens.
+    
+    Args:
+        ip_range: IP range (e.g., "192.168.1.*" or "192.168.1.1-255")
+    """
+    return run_nmap_command([ip_range])
+
+@mcp.tool()
+def scan_tcp_port(target: str, port: str) -> str:
+    """Scan specific TCP port on target.
+    
+    Args:
+        target: IP address or hostname
+        port: TCP port (e.g., "T:80,443" or just "80")
+    """
+    return run_nmap_command(["-p", port, target])
+
+@mcp.tool()
+def scan_top_ports(target: str, num_ports: int = 10) -> str:
+    """Scan the top N most common ports.
+    
+    Args:
+        target: IP address or hostname
+        num_ports: Number of top ports to scan (default: 10)
+    """
+    return run_nmap_command(["--top-ports", str(num_ports), target])
+
+@mcp.tool()
+def scan_from_file(file_path: str) -> str:
+    """Scan hosts listed in a file.
+    
+    Args:
+        file_path: Path to file containing list of IP addresses/hostnames
+    """
+    return run_nmap_command(["-iL", file_path])
+
+@mcp.tool()
+def scan_with_normal_output(target: str, output_file: str = "output.txt") -> str:
+    """Perform scan and save results to text file.
+    
+    Args:
+        target: IP address or hostname
+        output_file: Output filename (default: output.txt)
+    """
+    return run_nmap_command(["-oN", output_file, target])
+
+@mcp.tool()
+def scan_with_xml_output(target: str, output_file: str = "output.xml") -> str:
+    """Perform scan and save results to XML file.
+    
+    Args:
+        target: IP address or hostname
+        output_file: Output filename (default: output.xml)
+    """
+    return run_nmap_command(["-oX", output_file, target])
+
+@mcp.tool()
+def scan_with_all_formats(target: str, output_base: str = "output") -> str:
+    """Perform scan and save results in all available formats.
+    
+    Args:
+        target: IP address or hostname
+        output_base: Base filename for outputs (will create .xml, .nmap, .gnmap files)
+    """
+    return run_nmap_command(["-oA", output_base, target])
+
+# Nmap's help text only changes when Nmap is upgraded
+_HELP_CACHE: str | None = None
+
+@mcp.tool()
+def nmap_help() -> str:
+    """Display Nmap help with all available options and flags."""
+    global _HELP_CACHE
+    if _HELP_CACHE is None:
+        output = run_nmap_command(["-h"])
+        if not output or output.startswith("Error running Nmap"):
+            return output
+        _HELP_CACHE = output
+    return _HELP_CACHE
+
+# Scan techniques exposed through the scan tool; SCAN_FLAGS has one entry per kind
+ScanKind = Literal["default", "stealth", "tcp_connect", "udp", "fin", "xmas", "null", "service_version", "aggressive"]
+SCAN_FLAGS: dict[ScanKind, tuple[str, ...]] = {
+    "default": (),
+    "stealth": ("-sS",),
+    "tcp_connect": ("-sT",),
+    "udp": ("-sU",),
+    "fin": ("-sF",),
+    "xmas": ("-sX",),
+    "null": ("-sN",),
+    "service_version": ("-sV",),
+    "aggressive": ("-A",),
+}
+
+@mcp.tool()
+def scan(
+    kind: ScanKind,
+    target: str,
+    no_ping: bool = False,
+    ports: str | None = None,
+    top_ports: int | None = None
+) -> str:
+    """Run an Nmap scan of the given kind, optionally without host discovery.
+
+    Kinds:
+        default: Nmap's default scan
+        stealth: SYN scan without completing the TCP handshake (-sS)
+        tcp_connect: TCP Connect scan that completes the full handshake (-sT)
+        udp: UDP port scan (-sU)
+        fin: FIN scan using FIN packets (-sF)
+        xmas: Xmas scan with FIN, PSH, and URG flags set (-sX)
+        null: NULL scan with no flags set (-sN)
+        service_version: Service version detection (-sV)
+        aggressive: OS, service detection, and traceroute (-A)
+
+    Args:
+        kind: Scan technique to use (see Kinds)
+        target: IP address or hostname
+        no_ping: Skip host discovery and treat the target as up (-Pn)
+        ports: Port range (e.g., 20-80 or 22,80,443)
+        top_ports: Number of top ports to scan
+    """
+    args = list(SCAN_FLAGS[kind])
+    if ports:
+        args += ["-p", ports]
+    if top_ports:
+        args += ["--top-ports", str(top_ports)]
+    if no_ping:
+        args.append("-Pn")
+    args.append(target)
+    return run_nmap_command(args)
+
+def _is_nmap_binary(token: str) -> bool:
+    """Return whether a command token names the Nmap binary, e.g. nmap, /usr/bin/nmap or nmap.exe."""
+    name = os.path.basename(token.replace("\\", "/"))
+    return os.path.splitext(name)[0].lower() == "nmap"
+
+# First argument of a Windows command line, either double-quoted or up to whitespace
+_WINDOWS_FIRST_ARG = re.compile(r'\s*("[^"]*"|\S+)')
+
+def _custom_command_args(command: str) -> list[str] | str:
+    """Build the Popen arguments for a custom command, dropping any leading nmap token.
+
+    POSIX splits the command with shell rules. Windows passes the rest of the
+    command line through as a string, so CreateProcess and the C runtime parse
+    quoting and backslashes natively (e.g. --script-args="user=admin, pass=x").
+    """
+    if os.name != "nt":
+        argv = shlex.split(command)
+        if argv and _is_nmap_binary(argv[0]):
+            argv = argv[1:]
+        return [NMAP_BIN, *argv]
+    first = _WINDOWS_FIRST_ARG.match(command)
+    if first and _is_nmap_binary(first.group(1).strip('"')):
+        command = command[first.end():]
+    return f"{subprocess.list2cmdline([NMAP_BIN])} {command.strip()}".rstrip()
+
+@mcp.tool()
+def execute_custom_nmap_command(command: str) -> str:
+    """Execute any nmap command and return the output. This should be executed if the user wants to run a custom nmap command that is not predefined in the MCP tools.
+    Args:
+        command: Complete nmap command to execute (e.g., "-sS -p 80,443 scanme.nmap.org")
+        
+    Examples:
+        execute_custom_nmap_command("nmap -sS -O 192.168.1.1")
+        execute_custom_nmap_command("nmap -sV --script=vulscan/vulscan.nse -p 80,443 scanme.nmap.org")
+
+    The command is split into arguments and passed to nmap directly, without a shell.
+    """
+    try:
+        args = _custom_command_args(command)
+        # Run in its own session so a timeout can kill Nmap and anything it spawned.
+        # That trades away the posix_spawn fast path, so close_fds=False is not used
+        with subprocess.Popen(
+            args,
+            executable=NMAP_BIN,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True
+        ) as proc:
+            try:
+                stdout, stderr = proc.communicate(timeout=CUSTOM_COMMAND_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(proc)
+                proc.communicate()
+                raise
+        
+        # Return both stdout and stderr if available
+        output = ""
+        if stdout:
+            output += f"STDOUT:\n{stdout}\n"
+        if stderr:
+            output += f"STDERR:\n{stderr}\n"
+        if proc.returncode != 0:
+            output += f"Return Code: {proc.returncode}\n"
+            
+        return output if output else "Command executed successfully with no output."
+        
+    except subprocess.TimeoutExpired:
+        return f"Error: Command timed out after {CUSTOM_COMMAND_TIMEOUT} seconds"
+    except Exception as e:
+        return f"Error executing command: {str(e)}"
+
+if __name__ == "__main__":
+    mcp.run(transport='stdio')
@@ -3,125 +3,291 @@ Test cases for MCP-Based Vulnerability Scanner
 
 This file contains actual working unit tests for the security scanning functionality.
 These tests actually import and test the MCP security server operations.
+
+The test classes share no state, so they can run in parallel with pytest-xdist:
+    pytest -n auto --dist loadscope tests/
 """
 
 import unittest
 import sys
 import os
-from unittest.mock import patch, MagicMock, call
+import functools
+import signal
+import tempfile
+import time
+import types
+from typing import get_args
+from unittest.mock import patch, call
 import subprocess
 
 # Add the src directory to the path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'mcp-security'))
 
-try:
-    # Try to import the actual MCP security module
-    import importlib.util
-    spec = importlib.util.spec_from_file_location(
-        "mcp_security", 
-        os.path.join(os.path.dirname(__file__), '..', 'src', 'mcp-security', 'mcp-security.py')
-    )
-    mcp_security = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mcp_security)
-    MCP_AVAILABLE = True
-except Exception as e:
-    print(f"Warning: Could not import MCP security module: {e}")
-    MCP_AVAILABLE = False
+@functools.cache
+def _load_mcp():
+    """Import the MCP security module once per process.
+
+    Returns the module and whether it could be loaded.
+    """
+    try:
+        import mcp_security
+        return mcp_security, True
+    except Exception as e:
+        print(f"Warning: Could not import MCP security module: {e}")
+        return None, False
 
+@unittest.skipUnless(_load_mcp()[1], "MCP security module not available")
 class TestMCPSecurity(unittest.TestCase):
     """Test cases for the MCP Security Scanner"""
 
+    test_target = "127.0.0.1"
+    test_ports = "80,443"
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the MCP security module and patch subprocess.run for every test."""
+        cls.mcp_security, cls.MCP_AVAILABLE = _load_mcp()
+        cls._subprocess_patcher = patch('subprocess.run')
+        cls.mock_subprocess = cls._subprocess_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Restore subprocess.run."""
+        cls._subprocess_patcher.stop()
+
     def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.test_target = "127.0.0.1"
-        self.test_ports = "80,443"
+        """Reset the scan cache and subprocess mock before each test method."""
+        self.mcp_security.clear_scan_cache()
+        self.mock_subprocess.reset_mock(return_value=True, side_effect=True)
 
-    @unittest.skipUnless(MCP_AVAILABLE, "MCP security module not available")
-    @patch('subprocess.run')
-    def test_run_nmap_command_success(self, mock_subprocess):
+    def test_run_nmap_command_success(self):
         """Test that run_nmap_command executes subprocess correctly"""
         # Mock successful subprocess response
-        mock_result = MagicMock()
-        mock_result.stdout = "Host is up (0.0010s latency).\nNmap done: 1 IP address (1 host up) scanned"
-        mock_subprocess.return_value = mock_result
+        mock_result = types.SimpleNamespace(
+            stdout="Host is up (0.0010s latency).\nNmap done: 1 IP address (1 host up) scanned",
+            stderr="",
+            returncode=0
+        )
+        self.mock_subprocess.return_value = mock_result
         
         # Test the actual function
-        result = mcp_security.run_nmap_command(["-T4", self.test_target])
+        result = self.mcp_security.run_nmap_command(["-T4", self.test_target])
         
         # Verify subprocess was called with correct arguments
-        mock_subprocess.assert_called_once_with(
-            ["nmap", "-T4", self.test_target],
-            capture_output=True,
+        self.mock_subprocess.assert_called_once_with(
+            [self.mcp_security.NMAP_BIN, "-T4", self.test_target],
+            executable=self.mcp_security.NMAP_BIN,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=60
+            timeout=60,
+            close_fds=False
         )
         
         # Verify the result
         self.assertIn("Host is up", result)
         self.assertIn("1 IP address", result)
 
-    @unittest.skipUnless(MCP_AVAILABLE, "MCP security module not available")
-    @patch('subprocess.run')
-    def test_run_nmap_command_exception(self, mock_subprocess):
-        """Test that run_nmap_command handles exceptions properly"""
-        # Mock subprocess to raise an exception
-        mock_subprocess.side_effect = subprocess.TimeoutExpired("nmap", 60)
+    def test_run_nmap_command_exception(self):
+        """Test that run_nmap_command handles exceptions and timeouts properly"""
+        # Mock subprocess to raise a timeout straight away
+        self.mock_subprocess.side_effect = subprocess.TimeoutExpired("nmap", 60)
         
         # Test the actual function
-        result = mcp_security.run_nmap_command(["-T4", self.test_target])
+        result = self.mcp_security.run_nmap_command(["-T4", self.test_target])
         
-        # Verify error handling
+        # Verify error handling reports the timeout
+        self.mock_subprocess.assert_called_once()
         self.assertIn("Error running Nmap", result)
+        self.assertIn("timed out after 60 seconds", result)
 
-    @unittest.skipUnless(MCP_AVAILABLE, "MCP security module not available")
-    def test_simple_scan_function(self):
-        """Test the simple_scan function"""
-        # Patch the run_nmap_command function in the module namespace
-        with patch.object(mcp_security, 'run_nmap_command') as mock_run_nmap:
-            mock_run_nmap.return_value = "Nmap scan completed successfully"
-            
-            # Test the simple_scan function
-            result = mcp_security.simple_scan(self.test_target)
-            
-            # Verify run_nmap_command was called with correct arguments
-            mock_run_nmap.assert_called_once_with(["-T4", self.test_target])
-            
-            # Verify the result
-            self.assertEqual(result, "Nmap scan completed successfully")
+    def test_run_nmap_command_caches_result(self):
+        """Test that repeated identical scans reuse the cached output"""
+        mock_result = types.SimpleNamespace(stdout="Host is up", stderr="", returncode=0)
+        self.mock_subprocess.return_value = mock_result
 
-    @unittest.skipUnless(MCP_AVAILABLE, "MCP security module not available")
-    def test_port_scan_function(self):
-        """Test the port_scan function"""
-        with patch.object(mcp_security, 'run_nmap_command') as mock_run_nmap:
-            mock_run_nmap.return_value = "80/tcp open http\n443/tcp open https"
-            
-            result = mcp_security.port_scan(self.test_target, self.test_ports)
-            
-            mock_run_nmap.assert_called_once_with(["-p", self.test_ports, "-T4", self.test_target])
-            self.assertIn("80/tcp", result)
-            self.assertIn("443/tcp", result)
+        first = self.mcp_security.run_nmap_command(["-T4", self.test_target])
+        second = self.mcp_security.run_nmap_command(["-T4", self.test_target])
 
-    @unittest.skipUnless(MCP_AVAILABLE, "MCP security module not available")
-    def test_vulscan_basic_function(self):
-        """Test the vulscan_basic function"""
-        with patch.object(mcp_security, 'run_nmap_command') as mock_run_nmap:
-            mock_output = "CVE-2021-1234: Sample vulnerability\nCVE-2021-5678: Another vulnerability"
-            mock_run_nmap.return_value = mock_output
-            
-            result = mcp_security.vulscan_basic(self.test_target)
-            
-            # Verify correct vulscan arguments
-            expected_args = [
-                "-sV",
-                "--script=vulscan/vulscan.nse",
-                "--script-args", "\"vulscandb=cve.csv\"",
-                self.test_target
-            ]
-            mock_run_nmap.assert_called_once_with(expected_args)
-            
-            # Verify vulnerabilities are detected
-            self.assertIn("CVE-2021-1234", result)
-            self.assertIn("CVE-2021-5678", result)
+        self.assertEqual(first, second)
+        self.mock_subprocess.assert_called_once()
+
+        # Clearing the cache forces a fresh scan
+        self.mcp_security.clear_scan_cache()
+        self.mcp_security.run_nmap_command(["-T4", self.test_target])
+        self.assertEqual(self.mock_subprocess.call_count, 2)
+
+    def test_run_nmap_command_skips_cache_for_output_files(self):
+        """Test that scans writing output files are never served from cache"""
+        mock_result = types.SimpleNamespace(stdout="Nmap done", stderr="", returncode=0)
+        self.mock_subprocess.return_value = mock_result
+
+        args = ["-oN", "output.txt", self.test_target]
+        self.mcp_security.run_nmap_command(args)
+        self.mcp_security.run_nmap_command(args)
+
+        self.assertEqual(self.mock_subprocess.call_count, 2)
+
+    def test_run_nmap_command_skips_cache_for_input_files(self):
+        """Test that scans reading hosts from files rerun so edits to the file are seen"""
+        mock_result = types.SimpleNamespace(stdout="Nmap done", stderr="", returncode=0)
+        self.mock_subprocess.return_value = mock_result
+
+        for args in (["-iL", "hosts.txt"], [self.test_target, "--excludefile", "skip.txt"],
+                     [self.test_target, "--excludefile=skip.txt"]):
+            with self.subTest(args=args):
+                self.mock_subprocess.reset_mock()
+                self.mcp_security.run_nmap_command(args)
+                self.mcp_security.run_nmap_command(args)
+                self.assertEqual(self.mock_subprocess.call_count, 2)
+
+        self.mock_subprocess.reset_mock()
+        self.mcp_security.scan_from_file("hosts.txt")
+        self.mcp_security.scan_from_file("hosts.txt")
+        self.assertEqual(self.mock_subprocess.call_count, 2)
+
+    @patch('subprocess.Popen')
+    def test_run_nmap_command_max_lines_stops_scan(self, mock_popen):
+        """Test that a line limit stops Nmap once enough output has been read"""
+        mock_proc = mock_popen.return_value.__enter__.return_value
+        mock_proc.stdout = iter(["line 1\n", "line 2\n", "line 3\n", "line 4\n"])
+
+        result = self.mcp_security.run_nmap_command(["-sV", self.test_target], max_lines=2)
+
+        self.assertEqual(result, "line 1\nline 2\n")
+        mock_proc.terminate.assert_called_once()
+        self.assertTrue(mock_popen.call_args.kwargs['start_new_session'])
+
+    @patch('subprocess.Popen')
+    def test_run_nmap_command_max_lines_kills_stuck_scan(self, mock_popen):
+        """Test that Nmap is killed if it does not exit soon after being stopped"""
+        mock_proc = mock_popen.return_value.__enter__.return_value
+        mock_proc.stdout = iter(["line 1\n", "line 2\n"])
+        mock_proc.wait.side_effect = subprocess.TimeoutExpired("nmap", 5)
+
+        with patch.object(self.mcp_security, '_kill_process_group') as mock_kill:
+            self.mcp_security.run_nmap_command(["-sV", self.test_target], max_lines=1)
+
+        mock_proc.wait.assert_called_once_with(timeout=5)
+        mock_kill.assert_called_once_with(mock_proc)
+
+    @unittest.skipUnless(hasattr(os, "killpg"), "process groups not supported")
+    def test_stream_nmap_output_timeout_kills_children(self):
+        """Test that a line-limited scan times out even if Nmap's children hold the pipe"""
+        with tempfile.TemporaryDirectory() as tmp:
+            fake_nmap = os.path.join(tmp, "nmap")
+            with open(fake_nmap, "w") as f:
+                f.write("#!/bin/sh\necho started\nsleep 30 &\nsleep 30\n")
+            os.chmod(fake_nmap, 0o755)
+
+            started = time.monotonic()
+            with patch.object(self.mcp_security, 'NMAP_BIN', fake_nmap), \
+                 self.assertRaises(subprocess.TimeoutExpired):
+                self.mcp_security._stream_nmap_output([self.test_target], max_lines=10, timeout=0.2)
+
+        self.assertLess(time.monotonic() - started, 10)
+
+    @patch('os.cpu_count', return_value=4)
+    def test_scan_multiple_hosts_fan_out_shares_cache(self, mock_cpu_count):
+        """Test that fanned-out scans can fill and evict the shared cache concurrently"""
+        self.mock_subprocess.side_effect = lambda argv, **kwargs: types.SimpleNamespace(
+            stdout=" ".join(argv[1:]), stderr="", returncode=0
+        )
+        hosts = [f"10.0.0.{i}" for i in range(1, 9)]
+
+        with patch.object(self.mcp_security, 'SCAN_CACHE_MAXSIZE', 2):
+            for _ in range(20):
+                self.mcp_security.clear_scan_cache()
+                result = self.mcp_security.scan_multiple_hosts(" ".join(hosts), workers=4)
+                self.assertEqual(result.split(), hosts)
+
+        self.assertLessEqual(len(self.mcp_security._scan_cache), 2)
+
+    @patch('subprocess.Popen')
+    def test_custom_command_drops_nmap_binary_path(self, mock_popen):
+        """Test that a leading nmap binary is dropped whatever its path or extension"""
+        mock_proc = mock_popen.return_value.__enter__.return_value
+        mock_proc.communicate.return_value = ("", "")
+        mock_proc.returncode = 0
+
+        for command in ["/usr/bin/nmap -sS 10.0.0.1", "NMAP.EXE -sS 10.0.0.1",
+                        r'"C:\Program Files\Nmap\nmap.exe" -sS 10.0.0.1']:
+            with self.subTest(command=command):
+                self.mcp_security.execute_custom_nmap_command(command)
+                self.assertEqual(mock_popen.call_args.args[0],
+                                 [self.mcp_security.NMAP_BIN, "-sS", "10.0.0.1"])
+
+    def test_custom_command_quoted_script_args(self):
+        """Test that a quoted --script-args value stays one argument without its quotes"""
+        argv = self.mcp_security._custom_command_args('nmap --script-args="user=admin, pass=x" 10.0.0.1')
+
+        self.assertEqual(argv, [self.mcp_security.NMAP_BIN, "--script-args=user=admin, pass=x", "10.0.0.1"])
+
+    def test_custom_command_windows_command_line(self):
+        """Test that Windows gets the command line as a string for the C runtime to parse"""
+        nmap_bin = r"C:\Program Files\Nmap\nmap.exe"
+        with patch.object(self.mcp_security.os, 'name', 'nt'), \
+             patch.object(self.mcp_security, 'NMAP_BIN', nmap_bin):
+            command_line = self.mcp_security._custom_command_args(
+                r'nmap --script-args="user=admin, pass=x" '
+                r'-iL C:\scans\hosts.txt -oN "C:\out dir\scan.txt"'
+            )
+
+        self.assertEqual(
+            command_line,
+            r'"C:\Program Files\Nmap\nmap.exe" --script-args="user=admin, pass=x" '
+            r'-iL C:\scans\hosts.txt -oN "C:\out dir\scan.txt"'
+        )
+
+    @unittest.skipUnless(hasattr(os, "killpg"), "process groups not supported")
+    def test_custom_command_timeout_kills_process_group(self):
+        """Test that a timed-out custom command kills Nmap's whole process group"""
+        with patch('subprocess.Popen') as mock_popen, patch('os.killpg') as mock_killpg:
+            mock_proc = mock_popen.return_value.__enter__.return_value
+            mock_proc.communicate.side_effect = [subprocess.TimeoutExpired("nmap", 120), ("", "")]
+
+            result = self.mcp_security.execute_custom_nmap_command("nmap -sS 127.0.0.1")
+
+        self.assertTrue(mock_popen.call_args.kwargs['start_new_session'])
+        mock_killpg.assert_called_once_with(mock_proc.pid, signal.SIGKILL)
+        self.assertEqual(mock_proc.communicate.call_count, 2)
+        self.assertIn("timed out", result)
+
+    @unittest.skipUnless(hasattr(os, "killpg"), "process groups not supported")
+    def test_kill_process_group(self):
+        """Test that the process group is sent SIGKILL and a vanished group is ignored"""
+        proc = types.SimpleNamespace(pid=4321)
+        with patch('os.killpg') as mock_killpg:
+            self.mcp_security._kill_process_group(proc)
+            mock_killpg.assert_called_once_with(4321, signal.SIGKILL)
+
+            mock_killpg.side_effect = ProcessLookupError
+            self.mcp_security._kill_process_group(proc)
+
+    def test_kill_process_group_without_killpg(self):
+        """Test that platforms without process groups fall back to killing the process"""
+        proc = types.SimpleNamespace(pid=4321, kill_calls=0)
+        proc.kill = lambda: setattr(proc, 'kill_calls', proc.kill_calls + 1)
+        with patch.object(self.mcp_security, 'os', types.SimpleNamespace()):
+            self.mcp_security._kill_process_group(proc)
+        self.assertEqual(proc.kill_calls, 1)
+
+    @unittest.skipUnless(hasattr(os, "killpg"), "process groups not supported")
+    def test_custom_command_timeout_kills_forked_children(self):
+        """Test that a timed-out command returns promptly even if Nmap's children hold its pipes"""
+        with tempfile.TemporaryDirectory() as tmp:
+            fake_nmap = os.path.join(tmp, "nmap")
+            with open(fake_nmap, "w") as f:
+                f.write("#!/bin/sh\nsleep 30 &\nsleep 30\n")
+            os.chmod(fake_nmap, 0o755)
+
+            started = time.monotonic()
+            with patch.object(self.mcp_security, 'NMAP_BIN', fake_nmap), \
+                 patch.object(self.mcp_security, 'CUSTOM_COMMAND_TIMEOUT', 0.2):
+                result = self.mcp_security.execute_custom_nmap_command("nmap 127.0.0.1")
+
+        self.assertIn("timed out", result)
+        self.assertLess(time.monotonic() - started, 10)
 
     def test_security_input_validation(self):
         """Test that potentially dangerous inputs are handled safely"""
@@ -133,50 +299,170 @@ class TestMCPSecurity(unittest.TestCase):
             "127.0.0.1$(id)"
         ]
         
-        for dangerous_input in dangerous_inputs:
-            with self.subTest(input=dangerous_input):
-                # This is a real security test - verify that dangerous characters
-                # are either rejected or properly escaped
-                if MCP_AVAILABLE:
-                    with patch.object(mcp_security, 'subprocess') as mock_subprocess_module:
-                        mock_result = MagicMock()
-                        mock_result.stdout = "safe output"
-                        mock_subprocess_module.run.return_value = mock_result
+        # One patch for every input; only the call record is reset between inputs
+        with patch.object(self.mcp_security, 'subprocess') as mock_subprocess_module:
+            mock_result = types.SimpleNamespace(stdout="safe output", stderr="", returncode=0)
+            mock_subprocess_module.run.return_value = mock_result
+            
+            for dangerous_input in dangerous_inputs:
+                with self.subTest(input=dangerous_input):
+                    # This is a real security test - verify that dangerous characters
+                    # are either rejected or properly escaped
+                    mock_subprocess_module.run.reset_mock()
+                    
+                    # Call the function with dangerous input
+                    try:
+                        result = self.mcp_security.simple_scan(dangerous_input)
                         
-                        # Call the function with dangerous input
-                        try:
-                            result = mcp_security.simple_scan(dangerous_input)
+                        # Verify that if the function runs, subprocess.run was called
+                        # with the dangerous input properly contained in a list
+                        if mock_subprocess_module.run.called:
+                            call_args = mock_subprocess_module.run.call_args[0][0]  # First positional argument
+                            # The dangerous input should be a single list element, not parsed
+                            self.assertIn(dangerous_input, call_args)
+                            # Should not be shell=True (which would be dangerous)
+                            call_kwargs = mock_subprocess_module.run.call_args[1]
+                            self.assertNotIn('shell', call_kwargs)
                             
-                            # Verify that if the function runs, subprocess.run was called
-                            # with the dangerous input properly contained in a list
-                            if mock_subprocess_module.run.called:
-                                call_args = mock_subprocess_module.run.call_args[0][0]  # First positional argument
-                                # The dangerous input should be a single list element, not parsed
-                                self.assertIn(dangerous_input, call_args)
-                                # Should not be shell=True (which would be dangerous)
-                                call_kwargs = mock_subprocess_module.run.call_args[1]
-                                self.assertNotIn('shell', call_kwargs)
-                                
-                        except Exception:
-                            # If an exception is raised, that's also acceptable security behavior
-                            pass
-
-    def test_timeout_handling(self):
-        """Test that scanning operations respect timeout limits"""
-        # This would test that long-running scans are terminated
-        # after the specified timeout period
-        if MCP_AVAILABLE:
-            with patch('subprocess.run') as mock_subprocess:
-                mock_subprocess.side_effect = subprocess.TimeoutExpired("nmap", 60)
-                result = mcp_security.run_nmap_command(["-T4", self.test_target])
-                self.assertIn("Error running Nmap", result)
+                    except Exception:
+                        # If an exception is raised, that's also acceptable security behavior
+                        pass
+
+@unittest.skipUnless(_load_mcp()[1], "MCP security module not available")
+class TestScanTools(unittest.TestCase):
+    """Test that the scan tools build the expected Nmap arguments"""
+
+    test_target = "127.0.0.1"
+    test_ports = "80,443"
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the MCP security module and patch run_nmap_command for every test."""
+        cls.mcp_security, cls.MCP_AVAILABLE = _load_mcp()
+        cls._nmap_patcher = patch.object(cls.mcp_security, 'run_nmap_command')
+        cls.mock_run_nmap = cls._nmap_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Restore run_nmap_command."""
+        cls._nmap_patcher.stop()
+
+    def setUp(self):
+        """Reset the run_nmap_command mock before each test method."""
+        self.mock_run_nmap.reset_mock(return_value=True, side_effect=True)
+
+    def test_simple_scan_function(self):
+        """Test the simple_scan function"""
+        self.mock_run_nmap.return_value = "Nmap scan completed successfully"
+        
+        # Test the simple_scan function
+        result = self.mcp_security.simple_scan(self.test_target)
+        
+        # Verify run_nmap_command was called with correct arguments
+        self.mock_run_nmap.assert_called_once_with(["-T4", self.test_target])
+        
+        # Verify the result
+        self.assertEqual(result, "Nmap scan completed successfully")
+
+    def test_table_registered_tool_descriptions(self):
+        """Test that table-built tools keep their descriptions and leave no loop variables behind"""
+        self.assertIn("target: IP address or hostname (e.g., scanme.nmap.org)",
+                      self.mcp_security.single_host_scan.__doc__)
+        self.assertIn("target: IP address or hostname\n", self.mcp_security.verbose_scan.__doc__)
+        self.assertFalse(hasattr(self.mcp_security, '_name'))
+
+    def test_port_scan_function(self):
+        """Test the port_scan function"""
+        self.mock_run_nmap.return_value = "80/tcp open http\n443/tcp open https"
+        
+        result = self.mcp_security.port_scan(self.test_target, self.test_ports)
+        
+        self.mock_run_nmap.assert_called_once_with(["-p", self.test_ports, "-T4", self.test_target])
+        self.assertIn("80/tcp", result)
+        self.assertIn("443/tcp", result)
+
+    def test_scan_function(self):
+        """Test that the scan tool builds arguments for each kind and option"""
+        # The advertised kinds and the flag table must list the same scans
+        self.assertEqual(set(get_args(self.mcp_security.ScanKind)), self.mcp_security.SCAN_FLAGS.keys())
+
+        for kind, flags in self.mcp_security.SCAN_FLAGS.items():
+            with self.subTest(kind=kind):
+                self.mcp_security.scan(kind, self.test_target)
+                self.mock_run_nmap.assert_called_with([*flags, self.test_target])
+
+        self.mcp_security.scan("udp", self.test_target, no_ping=True)
+        self.mock_run_nmap.assert_called_with(["-sU", "-Pn", self.test_target])
+
+        self.mcp_security.scan("default", self.test_target, no_ping=True, ports=self.test_ports)
+        self.mock_run_nmap.assert_called_with(["-p", self.test_ports, "-Pn", self.test_target])
+
+        self.mcp_security.scan("default", self.test_target, no_ping=True, top_ports=10)
+        self.mock_run_nmap.assert_called_with(["--top-ports", "10", "-Pn", self.test_target])
+
+    @patch('os.cpu_count', return_value=4)
+    def test_scan_multiple_hosts_with_workers(self, mock_cpu_count):
+        """Test that hosts are split across several Nmap runs when workers > 1"""
+        self.mock_run_nmap.side_effect = lambda hosts: " ".join(hosts)
+
+        result = self.mcp_security.scan_multiple_hosts("10.0.0.1 10.0.0.2 10.0.0.3", workers=2)
+
+        self.mock_run_nmap.assert_has_calls(
+            [call(["10.0.0.1", "10.0.0.2"]), call(["10.0.0.3"])], any_order=True
+        )
+        self.assertEqual(result, "10.0.0.1 10.0.0.2\n10.0.0.3")
+
+    def test_nmap_help_is_cached(self):
+        """Test that nmap_help only runs Nmap once"""
+        self.mock_run_nmap.return_value = "Nmap 7.94 ( https://nmap.org )"
+        with patch.object(self.mcp_security, '_HELP_CACHE', None):
+            first = self.mcp_security.nmap_help()
+            second = self.mcp_security.nmap_help()
+
+        self.mock_run_nmap.assert_called_once_with(["-h"])
+        self.assertEqual(first, second)
+
+    def test_combined_recon_function(self):
+        """Test that combined_recon merges the selected probes into one scan"""
+        self.mcp_security.combined_recon(self.test_target)
+        self.mock_run_nmap.assert_called_with(["-O", "-sV", "--traceroute", self.test_target])
+
+        self.mcp_security.combined_recon(self.test_target, do_os=False)
+        self.mock_run_nmap.assert_called_with(["-sV", "--traceroute", self.test_target])
+
+    def test_vulscan_basic_function(self):
+        """Test the vulscan_basic function"""
+        mock_output = "CVE-2021-1234: Sample vulnerability\nCVE-2021-5678: Another vulnerability"
+        self.mock_run_nmap.return_value = mock_output
+        
+        result = self.mcp_security.vulscan_basic(self.test_target)
+        
+        # Verify correct vulscan arguments
+        expected_args = [
+            "-sV",
+            "--script=vulscan/vulscan.nse",
+            "--script-args", "\"vulscandb=cve.csv\"",
+            self.test_target
+        ]
+        self.mock_run_nmap.assert_called_once_with(expected_args)
+        
+        # Verify vulnerabilities are detected
+        self.assertIn("CVE-2021-1234", result)
+        self.assertIn("CVE-2021-5678", result)
+
+    def test_vulscan_output_limit_function(self):
+        """Test that vulscan_output_limit passes its limit through to the scan"""
+        self.mock_run_nmap.return_value = "CVE-2021-1234 - Sample vulnerability\n"
+
+        result = self.mcp_security.vulscan_output_limit(self.test_target, limit=1)
+
+        self.assertEqual(self.mock_run_nmap.call_args.kwargs, {"max_lines": 1})
+        self.assertEqual(result, "CVE-2021-1234 - Sample vulnerability")
 
 class TestGeminiIntegration(unittest.TestCase):
     """Test cases for Gemini AI integration"""
 
-    def setUp(self):
-        """Set up test fixtures for Gemini tests"""
-        self.sample_scan_output = """
+    sample_scan_output = """
         Nmap scan report for 127.0.0.1
         Host is up (0.0010s latency).
         PORT   STATE SERVICE
@@ -198,9 +484,8 @@ class TestGeminiIntegration(unittest.TestCase):
 class TestDatabaseOperations(unittest.TestCase):
     """Test cases for SQLite database operations"""
 
-    def setUp(self):
-        """Set up test database"""
-        self.test_db_path = "test_scans.db"
+    # Unique per process so parallel workers don't remove each other's database
+    test_db_path = f"test_scans_{os.getpid()}.db"
 
     def test_scan_storage(self):
         """Test storing scan results in database"""
@@ -220,17 +505,22 @@ class TestDatabaseOperations(unittest.TestCase):
 
 class TestCommandSafety(unittest.TestCase):
     """Test the safety of command execution"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the MCP security module shared by these tests."""
+        cls.mcp_security, cls.MCP_AVAILABLE = _load_mcp()
     
     def test_subprocess_call_safety(self):
         """Test that subprocess calls are made safely"""
-        if MCP_AVAILABLE:
-            with patch.object(mcp_security, 'subprocess') as mock_subprocess_module:
-                mock_result = MagicMock()
-                mock_result.stdout = "test output"
+        if self.MCP_AVAILABLE:
+            self.mcp_security.clear_scan_cache()
+            with patch.object(self.mcp_security, 'subprocess') as mock_subprocess_module:
+                mock_result = types.SimpleNamespace(stdout="test output", stderr="", returncode=0)
                 mock_subprocess_module.run.return_value = mock_result
                 
                 # Test that commands are passed as lists, not strings
-                mcp_security.run_nmap_command(["-T4", "127.0.0.1"])
+                self.mcp_security.run_nmap_command(["-T4", "127.0.0.1"])
                 
                 # Verify subprocess.run was called safely
                 self.assertTrue(mock_subprocess_module.run.called)
@@ -238,27 +528,50 @@ class TestCommandSafety(unittest.TestCase):
                 
                 # First argument should be a list (safe)
                 self.assertIsInstance(call_args[0], list)
-                # Should start with 'nmap'
-                self.assertEqual(call_args[0][0], "nmap")
+                # Should start with the resolved nmap binary
+                self.assertEqual(call_args[0][0], self.mcp_security.NMAP_BIN)
                 # Should not use shell=True (dangerous)
                 self.assertNotIn('shell', call_kwargs)
                 self.assertFalse(call_kwargs.get('shell', False))
 
+    def test_custom_command_does_not_use_shell(self):
+        """Test that custom commands are split into arguments instead of run by a shell"""
+        if self.MCP_AVAILABLE:
+            with patch.object(self.mcp_security, 'subprocess') as mock_subprocess_module:
+                mock_proc = mock_subprocess_module.Popen.return_value.__enter__.return_value
+                mock_proc.communicate.return_value = ("test output", "")
+                mock_proc.returncode = 0
+
+                self.mcp_security.execute_custom_nmap_command("nmap -sS -p 80 '127.0.0.1; id'")
+
+                call_args, call_kwargs = mock_subprocess_module.Popen.call_args
+                # The leading "nmap" is replaced by the resolved binary
+                self.assertEqual(call_args[0], [self.mcp_security.NMAP_BIN, "-sS", "-p", "80", "127.0.0.1; id"])
+                self.assertFalse(call_kwargs.get('shell', False))
+
+
 class TestMCPServerIntegration(unittest.TestCase):
     """Test MCP server integration (if available)"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the MCP security module shared by these tests."""
+        cls.mcp_security, cls.MCP_AVAILABLE = _load_mcp()
     
     def test_mcp_server_initialization(self):
         """Test that the MCP server can be initialized"""
-        if MCP_AVAILABLE:
+        if self.MCP_AVAILABLE:
             # Test that the MCP server object exists
-            self.assertTrue(hasattr(mcp_security, 'mcp'))
-            self.assertIsNotNone(mcp_security.mcp)
+            self.assertTrue(hasattr(self.mcp_security, 'mcp'))
+            self.assertIsNotNone(self.mcp_security.mcp)
 
 if __name__ == '__main__':
-    if MCP_AVAILABLE:
-        print("✅ MCP Security module loaded successfully - running real tests")
-    else:
-        print("⚠️  MCP Security module not available - running limited tests")
+    # Only print the banner and per-test lines for interactive runs; CI logs get dots
+    interactive = sys.stdout.isatty()
+    if interactive:
+        if _load_mcp()[1]:
+            print("✅ MCP Security module loaded successfully - running real tests")
+        else:
+            print("⚠️  MCP Security module not available - running limited tests")
     
-    # Run the tests with detailed output
-    unittest.main(verbosity=2) 
\ No newline at end of file
+    unittest.main(verbosity=2 if interactive else 1, buffer=True)